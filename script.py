@@ -1,11 +1,15 @@
 import os
 import re
 import logging
+import tempfile
 import pandas as pd
+import pymupdf
 import mysql.connector
-from PyPDF2 import PdfReader
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from itertools import repeat
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -22,8 +26,49 @@ DB_CONFIG = {
     "user": "root",
     "password": "",  # Update with your password
     "database": "dlh_data_warehouse",  # Menggunakan nama database baru untuk skema baru
+    # Restrict LOAD DATA LOCAL INFILE to the temp dir holding the bulk load TSVs
+    "allow_local_infile_in_path": tempfile.gettempdir(),
+    "use_pure": False,  # Use the C extension driver (mysql-connector-python[cext])
 }
 
+# Folders with at least this many PDFs stream their transcript facts into
+# Fact_Transkrip with LOAD DATA LOCAL INFILE instead of batched INSERTs
+BULK_LOAD_MIN_FILES = 100
+
+# Number of loaded transcripts per commit while processing a folder
+COMMIT_BATCH_SIZE = 50
+
+# Precompiled regex patterns for text cleaning and transcript parsing
+_RE_CAP_SPACE_LOW = re.compile(r"\b([A-Z])\s([a-z])")
+_RE_LOW_CAP = re.compile(r"([a-z])([A-Z])")
+_RE_WS = re.compile(r"\s+")
+_RE_NRP_NAMA = re.compile(r"NRP\s*/\s*Nama\s*(\d+)\s*/\s*(.*?)\s*SKS Tempuh", re.DOTALL)
+_RE_SKS = re.compile(r"SKS\s*Tempuh\s*/\s*SKS\s*Lulus\s*(\d+)\s*/\s*(\d+)")
+_RE_STATUS = re.compile(r"Status\s*(.*?)(?=\s*Tahap|---)", re.DOTALL)
+_RE_IPK = re.compile(r"IPK\s*([\d.]+)")
+_RE_IP_PERSIAPAN = re.compile(r"IP Tahap Persiapan\s*:\s*([\d.]+)", re.IGNORECASE)
+_RE_SKS_PERSIAPAN = re.compile(r"Total Sks Tahap Persiapan\s*:\s*(\d+)", re.IGNORECASE)
+_RE_IP_SARJANA = re.compile(r"IP Tahap Sarjana\s*:\s*([\d.]+)", re.IGNORECASE)
+_RE_SKS_SARJANA = re.compile(r"Total Sks Tahap Sarjana\s*:\s*(\d+)", re.IGNORECASE)
+_RE_SARJANA_START = re.compile(r"Tahap:\s*Sarjana")
+# Cleaned text is a single line, and bounding the course name keeps a code with
+# no grade after it from dragging the lazy match across the rest of the document
+_RE_COURSE = re.compile(
+    r"([A-Z]{2}\d{5,6})\s*(.{0,200}?)\s*(\d)\s*(\d{4})/(Gs|Gn)/[A-Z]{1,2}\s*([A-Z]{1,2})"
+)
+
+
+class Course(NamedTuple):
+    """One course row parsed from a transcript"""
+
+    kode_mk: str
+    nama_mk: str
+    sks_mk: int
+    tahun: int
+    semester: str
+    huruf_nilai: str
+    tahap_mk: str
+
 
 class TranscriptETL:
     """Main ETL class for processing academic transcripts"""
@@ -31,12 +76,27 @@ class TranscriptETL:
     def __init__(self, db_config: Dict):
         self.db_config = db_config
         self.connection = None
-        self.grade_to_bobot = {}  # To store grade to bobot mapping
+        self.grade_info = {}  # To store grade to (id_nilai, bobot) mapping
+        # Dimension key caches shared across files, keyed by natural key tuple
+        self._mk_cache: Dict[Tuple[str], int] = {}
+        self._waktu_cache: Dict[Tuple[int, str], int] = {}
+        # Fact rows held back for a LOAD DATA bulk load, None when loading directly
+        self._deferred_fact_rows: Optional[List[Tuple]] = None
+        # Set when a failed load had to roll back the whole open transaction
+        self._batch_lost = False
 
     def connect_db(self) -> bool:
         """Establish database connection"""
         try:
-            self.connection = mysql.connector.connect(**self.db_config)
+            try:
+                self.connection = mysql.connector.connect(**self.db_config)
+            except ImportError:
+                logger.warning(
+                    "MySQL C extension is not available, using the pure Python driver."
+                )
+                self.connection = mysql.connector.connect(
+                    **{**self.db_config, "use_pure": True}
+                )
             logger.info("Successfully connected to the database.")
             return True
         except mysql.connector.Error as err:
@@ -125,6 +185,7 @@ class TranscriptETL:
             logger.info("Schema setup is complete.")
 
             self._insert_reference_data()
+            self._load_dimension_caches()
 
         except mysql.connector.Error as err:
             logger.error(f"Failed to create schema: {err}")
@@ -157,10 +218,10 @@ class TranscriptETL:
                 )
                 logger.info("Initial grade data has been inserted into Dim_Nilai.")
 
-            # Fetch grades into memory for IPS/IPK calculation
-            cursor.execute("SELECT huruf_nilai, bobot_nilai FROM Dim_Nilai")
+            # Fetch grades into memory for IPS/IPK calculation and fact loading
+            cursor.execute("SELECT id_nilai, huruf_nilai, bobot_nilai FROM Dim_Nilai")
             for row in cursor.fetchall():
-                self.grade_to_bobot[row[0]] = float(row[1])
+                self.grade_info[row[1]] = (row[0], float(row[2]))
             logger.info("Loaded grade-to-weight mapping into memory.")
 
             self.connection.commit()
@@ -171,27 +232,65 @@ class TranscriptETL:
         finally:
             cursor.close()
 
+    def _load_dimension_caches(self):
+        """Prefetch existing course and time dimension keys into memory"""
+        cursor = self.connection.cursor()
+
+        try:
+            cursor.execute("SELECT kode_mk, id_mk FROM Dim_MataKuliah")
+            for row in cursor.fetchall():
+                self._mk_cache[(row[0],)] = row[1]
+
+            cursor.execute("SELECT tahun, semester, id_waktu FROM Dim_Waktu")
+            for row in cursor.fetchall():
+                self._waktu_cache[(row[0], row[1])] = row[2]
+            logger.info("Loaded dimension key caches into memory.")
+
+        except mysql.connector.Error as err:
+            logger.error(f"Problem prefetching dimension keys: {err}")
+        finally:
+            cursor.close()
+
+    def _clear_dimension_caches(self):
+        """Drop cached dimension keys, e.g. after a rollback discarded new rows"""
+        self._mk_cache.clear()
+        self._waktu_cache.clear()
+
     def extract_pdf_text(self, pdf_path: str) -> str:
         """Extract text from PDF file and apply advanced cleaning."""
         try:
-            with open(pdf_path, "rb") as file:
-                reader = PdfReader(file)
-                full_text = ""
-                for page in reader.pages:
-                    page_text = page.extract_text() or ""
-                    cleaned_text = re.sub(r"\b([A-Z])\s([a-z])", r"\1\2", page_text)
-                    cleaned_text = re.sub(r"([a-z])([A-Z])", r"\1 \2", cleaned_text)
-                    cleaned_text = re.sub(r"\s+", " ", cleaned_text).strip()
-                    full_text += cleaned_text + "\n"
-
-                logger.info(
-                    f"Text extracted and cleaned from {os.path.basename(pdf_path)}."
+            try:
+                with pymupdf.open(pdf_path) as doc:
+                    raw_text = "\n".join(
+                        page.get_text("text", sort=True) for page in doc
+                    )
+            except pymupdf.FileDataError as err:
+                logger.warning(
+                    f"PyMuPDF could not read {os.path.basename(pdf_path)} ({err}), retrying with PyPDF2."
                 )
-                return full_text
+                raw_text = self._extract_raw_text_pypdf2(pdf_path)
+
+            # Clean the whole document in one pass per pattern
+            cleaned_text = _RE_CAP_SPACE_LOW.sub(r"\1\2", raw_text)
+            cleaned_text = _RE_LOW_CAP.sub(r"\1 \2", cleaned_text)
+            full_text = _RE_WS.sub(" ", cleaned_text).strip()
+
+            logger.info(
+                f"Text extracted and cleaned from {os.path.basename(pdf_path)}."
+            )
+            return full_text
         except Exception as e:
             logger.error(f"Could not read PDF file {pdf_path}: {e}")
             return ""
 
+    def _extract_raw_text_pypdf2(self, pdf_path: str) -> str:
+        """Fallback extractor for PDFs that MuPDF rejects as malformed"""
+        from PyPDF2 import PdfReader  # Optional, only needed for the fallback
+
+        with open(pdf_path, "rb") as file:
+            reader = PdfReader(file)
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+
     def parse_transcript(self, text: str) -> Optional[Dict]:
         """Parse transcript text and extract structured data"""
         try:
@@ -230,103 +329,96 @@ class TranscriptETL:
     def _parse_student_info(self, text: str) -> Optional[Dict]:
         """Parse student information from the cleaned transcript text"""
         try:
-            nrp_nama_match = re.search(
-                r"NRP\s*/\s*Nama\s*(\d+)\s*/\s*(.*?)\s*SKS Tempuh", text, re.DOTALL
-            )
-            sks_match = re.search(
-                r"SKS\s*Tempuh\s*/\s*SKS\s*Lulus\s*(\d+)\s*/\s*(\d+)", text
-            )
-            status_match = re.search(r"Status\s*(.*?)(?=\s*Tahap|---)", text, re.DOTALL)
-            ipk_match = re.search(r"IPK\s*([\d.]+)", text)
+            nrp_nama_match = _RE_NRP_NAMA.search(text)
+            sks_match = _RE_SKS.search(text)
+            status_match = _RE_STATUS.search(text)
+            ipk_match = _RE_IPK.search(text)
 
-            ip_persiapan_match = re.search(
-                r"IP Tahap Persiapan\s*:\s*([\d.]+)", text, re.IGNORECASE
-            )
-            sks_persiapan_match = re.search(
-                r"Total Sks Tahap Persiapan\s*:\s*(\d+)", text, re.IGNORECASE
-            )
-            ip_sarjana_match = re.search(
-                r"IP Tahap Sarjana\s*:\s*([\d.]+)", text, re.IGNORECASE
-            )
-            sks_sarjana_match = re.search(
-                r"Total Sks Tahap Sarjana\s*:\s*(\d+)", text, re.IGNORECASE
-            )
+            ip_persiapan_match = _RE_IP_PERSIAPAN.search(text)
+            sks_persiapan_match = _RE_SKS_PERSIAPAN.search(text)
+            ip_sarjana_match = _RE_IP_SARJANA.search(text)
+            sks_sarjana_match = _RE_SKS_SARJANA.search(text)
 
             if not all([nrp_nama_match, sks_match, status_match, ipk_match]):
                 logger.error("Missing required fields in student header.")
                 return None
 
-            nama = re.sub(r"\s+", " ", nrp_nama_match.group(2)).strip()
-            status = re.sub(r"\s+", " ", status_match.group(1)).strip()
+            nama = _RE_WS.sub(" ", nrp_nama_match.group(2)).strip()
+            status = _RE_WS.sub(" ", status_match.group(1)).strip()
+
+            # Optional phase fields default to zero when the summary is missing
+            sks_tempuh, sks_lulus, sks_persiapan, sks_sarjana = map(
+                int,
+                (
+                    sks_match.group(1),
+                    sks_match.group(2),
+                    sks_persiapan_match.group(1) if sks_persiapan_match else 0,
+                    sks_sarjana_match.group(1) if sks_sarjana_match else 0,
+                ),
+            )
+            ipk, ip_persiapan, ip_sarjana = map(
+                float,
+                (
+                    ipk_match.group(1),
+                    ip_persiapan_match.group(1) if ip_persiapan_match else 0.0,
+                    ip_sarjana_match.group(1) if ip_sarjana_match else 0.0,
+                ),
+            )
 
             return {
                 "nrp": nrp_nama_match.group(1).strip(),
                 "nama_mahasiswa": nama,
                 "status_mahasiswa": status,
-                "sks_tempuh": int(sks_match.group(1)),
-                "sks_lulus": int(sks_match.group(2)),
-                "ipk": float(ipk_match.group(1)),
-                "ip_persiapan": (
-                    float(ip_persiapan_match.group(1)) if ip_persiapan_match else 0.0
-                ),
-                "sks_persiapan": (
-                    int(sks_persiapan_match.group(1)) if sks_persiapan_match else 0
-                ),
-                "ip_sarjana": (
-                    float(ip_sarjana_match.group(1)) if ip_sarjana_match else 0.0
-                ),
-                "sks_sarjana": (
-                    int(sks_sarjana_match.group(1)) if sks_sarjana_match else 0
-                ),
+                "sks_tempuh": sks_tempuh,
+                "sks_lulus": sks_lulus,
+                "ipk": ipk,
+                "ip_persiapan": ip_persiapan,
+                "sks_persiapan": sks_persiapan,
+                "ip_sarjana": ip_sarjana,
+                "sks_sarjana": sks_sarjana,
             }
         except Exception as e:
             logger.error(f"Problem parsing student information: {e}")
             return None
 
-    def _parse_courses(self, text: str) -> List[Dict]:
+    def _parse_courses(self, text: str) -> List[Course]:
         """Parse course information from the cleaned transcript text"""
         try:
             courses = []
 
-            course_pattern = r"([A-Z]{2}\d{5,6})\s*(.*?)\s*(\d)\s*(\d{4}/(?:Gs|Gn)/[A-Z]{1,2})\s*([A-Z]{1,2})"
-
-            matches = re.finditer(course_pattern, text, re.DOTALL)
-
-            sarjana_start_match = re.search(r"Tahap:\s*Sarjana", text)
-            sarjana_start_pos = (
-                sarjana_start_match.start() if sarjana_start_match else -1
-            )
-
-            for match in matches:
-                course_name = re.sub(r"\s+", " ", match.group(2)).strip()
-                sks = int(match.group(3))
-                hist_info = match.group(4)
-                grade = match.group(5)
-
-                year_sem_match = re.search(r"(\d{4})/(Gs|Gn)", hist_info)
-                if not year_sem_match:
-                    continue
-
-                year, sem_code = year_sem_match.groups()
-
-                phase = (
-                    "Sarjana"
-                    if sarjana_start_pos != -1 and match.start() > sarjana_start_pos
-                    else "Persiapan"
-                )
-                semester = "Gasal" if sem_code == "Gs" else "Genap"
-
-                courses.append(
-                    {
-                        "kode_mk": match.group(1).strip(),
-                        "nama_mk": course_name,
-                        "sks_mk": sks,
-                        "tahun": int(year),
-                        "semester": semester,
-                        "huruf_nilai": grade.strip(),
-                        "tahap_mk": phase,
-                    }
-                )
+            # Everything after the Sarjana marker belongs to the Sarjana phase
+            sarjana_start_match = _RE_SARJANA_START.search(text)
+            if sarjana_start_match:
+                sarjana_start_pos = sarjana_start_match.start()
+                persiapan_text = text[:sarjana_start_pos]
+                sarjana_text = text[sarjana_start_pos:]
+            else:
+                persiapan_text, sarjana_text = text, ""
+
+            for phase, phase_text in (
+                ("Persiapan", persiapan_text),
+                ("Sarjana", sarjana_text),
+            ):
+                for match in _RE_COURSE.finditer(phase_text):
+                    course_name = _RE_WS.sub(" ", match.group(2)).strip()
+                    sks = int(match.group(3))
+                    year = match.group(4)
+                    sem_code = match.group(5)
+                    grade = match.group(6)
+
+                    semester = "Gasal" if sem_code == "Gs" else "Genap"
+
+                    courses.append(
+                        Course(
+                            kode_mk=match.group(1).strip(),
+                            nama_mk=course_name,
+                            sks_mk=sks,
+                            tahun=int(year),
+                            semester=semester,
+                            huruf_nilai=grade.strip(),
+                            tahap_mk=phase,
+                        )
+                    )
 
             logger.info(f"Found and parsed {len(courses)} courses.")
             return courses
@@ -334,60 +426,44 @@ class TranscriptETL:
             logger.error(f"Problem parsing course data: {e}")
             return []
 
-    def _calculate_semester_history(self, courses: List[Dict]) -> List[Dict]:
+    def _calculate_semester_history(self, courses: List[Course]) -> List[Dict]:
         """Calculates IPS, IPK, and total SKS for each semester."""
-        semester_data = (
-            {}
-        )  # Key: (year, semester_name), Value: {'sks_semester': X, 'weighted_sks_semester': Y}
-
-        # Sort courses chronologically for cumulative IPK calculation
-        # 'Gasal' comes before 'Genap'
-        sorted_courses = sorted(
-            courses, key=lambda c: (c["tahun"], 0 if c["semester"] == "Gasal" else 1)
-        )
+        # Key: (year, semester_name), Value: [sks_semester, weighted_sks_semester]
+        semester_data = {}
+        grade_info = self.grade_info
 
-        # First pass to aggregate data per semester
-        for course in sorted_courses:
-            year = course["tahun"]
-            semester_name = course["semester"]
-            sks_mk = course["sks_mk"]
-            huruf_nilai = course["huruf_nilai"]
+        # First pass to aggregate data per semester; order does not matter here
+        for course in courses:
+            sks_mk = course.sks_mk
+            huruf_nilai = course.huruf_nilai
 
-            bobot_nilai = self.grade_to_bobot.get(huruf_nilai)
-            if bobot_nilai is None:
+            grade = grade_info.get(huruf_nilai)
+            if grade is None:
                 logger.warning(
-                    f"Weight for grade '{huruf_nilai}' is missing. Skipping {course['kode_mk']} in semester history calculation."
+                    f"Weight for grade '{huruf_nilai}' is missing. Skipping {course.kode_mk} in semester history calculation."
                 )
                 continue
+            bobot_nilai = grade[1]
 
-            weighted_sks = sks_mk * bobot_nilai
-
-            if (year, semester_name) not in semester_data:
-                semester_data[(year, semester_name)] = {
-                    "sks_semester": 0,
-                    "weighted_sks_semester": 0,
-                }
-
-            semester_data[(year, semester_name)]["sks_semester"] += sks_mk
-            semester_data[(year, semester_name)][
-                "weighted_sks_semester"
-            ] += weighted_sks
+            semester_key = (course.tahun, course.semester)
+            totals = semester_data.get(semester_key)
+            if totals is None:
+                totals = semester_data[semester_key] = [0, 0]
+            totals[0] += sks_mk
+            totals[1] += sks_mk * bobot_nilai
 
         # Second pass to calculate IPS and cumulative IPK
         history_list = []
         cumulative_sks_overall = 0
         cumulative_weighted_sks_overall = 0
 
-        # Ensure semesters are processed in chronological order
+        # Process semesters in chronological order ('Gasal' comes before 'Genap')
         sorted_semester_keys = sorted(
             semester_data.keys(), key=lambda x: (x[0], 0 if x[1] == "Gasal" else 1)
         )
 
         for year, semester_name in sorted_semester_keys:
-            sks_sem = semester_data[(year, semester_name)]["sks_semester"]
-            weighted_sks_sem = semester_data[(year, semester_name)][
-                "weighted_sks_semester"
-            ]
+            sks_sem, weighted_sks_sem = semester_data[(year, semester_name)]
 
             ips_semester = weighted_sks_sem / sks_sem if sks_sem > 0 else 0.0
 
@@ -416,31 +492,96 @@ class TranscriptETL:
         return history_list
 
     def load_to_warehouse(self, data: Dict) -> bool:
-        """Load parsed data into the new data warehouse schema"""
+        """Load parsed data into the new data warehouse schema.
+
+        The load runs inside a savepoint of the caller's transaction; committing
+        is left to the caller so a whole folder can share one transaction.
+        """
         if not self.connection:
             logger.error("Cannot load data, no database connection.")
             return False
 
-        cursor = self.connection.cursor(dictionary=True)
+        cursor = self.connection.cursor()
 
         try:
+            cursor.execute("SAVEPOINT transcript")
+
             id_mahasiswa = self._load_mahasiswa(cursor, data["student"])
             if not id_mahasiswa:
+                logger.error("Could not resolve the student key.")
+                self._rollback_transcript(cursor)
                 return False
 
-            # Load course facts
-            success_count_courses = 0
+            # Resolve all dimension keys in bulk, then batch-insert the facts
+            mk_rows = {}
+            waktu_rows = {}
             for course in data["courses"]:
-                if self._load_course_fact(cursor, id_mahasiswa, course):
-                    success_count_courses += 1
+                mk_rows.setdefault(
+                    (course.kode_mk,),
+                    (
+                        course.kode_mk,
+                        course.nama_mk,
+                        course.sks_mk,
+                        course.tahap_mk,
+                    ),
+                )
+                waktu_rows.setdefault(
+                    (course.tahun, course.semester),
+                    (course.tahun, course.semester),
+                )
+            for semester_entry in data["semester_history"]:
+                waktu_rows.setdefault(
+                    (semester_entry["tahun"], semester_entry["semester"]),
+                    (semester_entry["tahun"], semester_entry["semester"]),
+                )
 
-            # Load semester history facts
-            history_success_count = 0
+            mk_keys = self._get_or_create_keys(
+                cursor,
+                "Dim_MataKuliah",
+                "id_mk",
+                ("kode_mk",),
+                "INSERT INTO Dim_MataKuliah (kode_mk, nama_mk, sks_mk, tahap_mk) VALUES (%s, %s, %s, %s) "
+                "ON DUPLICATE KEY UPDATE id_mk = id_mk",
+                mk_rows,
+                self._mk_cache,
+            )
+            waktu_keys = self._get_or_create_keys(
+                cursor,
+                "Dim_Waktu",
+                "id_waktu",
+                ("tahun", "semester"),
+                "INSERT INTO Dim_Waktu (tahun, semester) VALUES (%s, %s) "
+                "ON DUPLICATE KEY UPDATE id_waktu = id_waktu",
+                waktu_rows,
+                self._waktu_cache,
+            )
+
+            fact_rows = []
+            for course in data["courses"]:
+                fact_row = self._build_course_fact(
+                    id_mahasiswa, course, mk_keys, waktu_keys
+                )
+                if fact_row:
+                    fact_rows.append(fact_row)
+
+            if self._deferred_fact_rows is None:
+                self._insert_fact_rows(cursor, fact_rows)
+            success_count_courses = len(fact_rows)
+
+            history_rows = []
             for semester_entry in data["semester_history"]:
-                if self._load_history_semester(cursor, id_mahasiswa, semester_entry):
-                    history_success_count += 1
+                history_row = self._build_history_fact(
+                    id_mahasiswa, semester_entry, waktu_keys
+                )
+                if history_row:
+                    history_rows.append(history_row)
 
-            self.connection.commit()
+            self._upsert_history_rows(cursor, history_rows)
+            history_success_count = len(history_rows)
+
+            cursor.execute("RELEASE SAVEPOINT transcript")
+            if self._deferred_fact_rows is not None:
+                self._deferred_fact_rows.extend(fact_rows)
             logger.info(
                 f"Loaded {success_count_courses} of {len(data['courses'])} courses for {data['student']['nama_mahasiswa']}."
             )
@@ -450,221 +591,209 @@ class TranscriptETL:
             return True
         except mysql.connector.Error as err:
             logger.error(f"A database error occurred while loading: {err}")
-            self.connection.rollback()
+            self._rollback_transcript(cursor)
             return False
         finally:
             cursor.close()
 
-    def _load_mahasiswa(self, cursor, student_data: Dict) -> Optional[int]:
-        """Load or update student data and return student key"""
-        try:
-            cursor.execute(
-                "SELECT id_mahasiswa FROM Dim_Mahasiswa WHERE NRP = %s",
-                (student_data["nrp"],),
-            )
-            result = cursor.fetchone()
-
-            student_columns = (
-                student_data["nama_mahasiswa"],
-                student_data["status_mahasiswa"],
-                student_data["ipk"],
-                student_data["sks_tempuh"],
-                student_data["sks_lulus"],
-                student_data["ip_persiapan"],
-                student_data["sks_persiapan"],
-                student_data["ip_sarjana"],
-                student_data["sks_sarjana"],
+    def _insert_fact_rows(self, cursor, fact_rows: List[Tuple]):
+        """Batch-insert transcript fact rows, skipping ones that already exist"""
+        if fact_rows:
+            cursor.executemany(
+                """INSERT IGNORE INTO Fact_Transkrip 
+                (id_mahasiswa, id_mk, id_waktu, id_nilai, bobot_matkul) 
+                VALUES (%s, %s, %s, %s, %s)""",
+                fact_rows,
             )
 
-            if result:
-                id_mahasiswa = result["id_mahasiswa"]
-                update_sql = """
-                    UPDATE Dim_Mahasiswa SET 
-                        nama_mahasiswa = %s, status_mahasiswa = %s, ipk_kumulatif = %s,
-                        sks_tempuh = %s, sks_lulus = %s, ip_persiapan = %s, sks_persiapan = %s,
-                        ip_sarjana = %s, sks_sarjana = %s
-                    WHERE id_mahasiswa = %s
-                """
-                cursor.execute(update_sql, student_columns + (id_mahasiswa,))
-                logger.info(
-                    f"Student record updated for: {student_data['nama_mahasiswa']}"
+    def _bulk_load_fact_rows(self, fact_rows: List[Tuple]):
+        """Stream fact rows into Fact_Transkrip through LOAD DATA LOCAL INFILE.
+
+        Falls back to batched inserts when the server refuses local infile.
+        """
+        cursor = self.connection.cursor()
+        tsv_file = tempfile.NamedTemporaryFile(
+            "w", suffix=".tsv", delete=False, newline=""
+        )
+
+        try:
+            with tsv_file:
+                for row in fact_rows:
+                    tsv_file.write("\t".join(str(value) for value in row) + "\n")
+
+            try:
+                cursor.execute(
+                    """LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE Fact_Transkrip
+                    FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n'
+                    (id_mahasiswa, id_mk, id_waktu, id_nilai, bobot_matkul)""",
+                    (tsv_file.name,),
                 )
-            else:
-                insert_sql = """
-                    INSERT INTO Dim_Mahasiswa (
-                        NRP, nama_mahasiswa, status_mahasiswa, ipk_kumulatif, sks_tempuh, 
-                        sks_lulus, ip_persiapan, sks_persiapan, ip_sarjana, sks_sarjana
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(insert_sql, (student_data["nrp"],) + student_columns)
-                id_mahasiswa = cursor.lastrowid
-                logger.info(
-                    f"New student record created for: {student_data['nama_mahasiswa']}"
+            except mysql.connector.Error as err:
+                logger.warning(
+                    f"LOAD DATA LOCAL INFILE is unavailable ({err}), using batched inserts."
                 )
+                self._insert_fact_rows(cursor, fact_rows)
 
-            return id_mahasiswa
+            logger.info(f"Bulk loaded {len(fact_rows)} transcript fact records.")
+        finally:
+            cursor.close()
+            os.remove(tsv_file.name)
+
+    def _rollback_transcript(self, cursor):
+        """Undo a failed transcript load without discarding the rest of the batch.
+
+        If the savepoint is gone (InnoDB rolls back the whole transaction on a
+        deadlock) the batch is rolled back and `_batch_lost` is set.
+        """
+        try:
+            cursor.execute("ROLLBACK TO SAVEPOINT transcript")
         except mysql.connector.Error as err:
-            logger.error(f"Failed to load student data: {err}")
-            return None
+            logger.error(f"Could not roll back to savepoint, rolling back batch: {err}")
+            self.connection.rollback()
+            self._batch_lost = True
+        self._clear_dimension_caches()
 
-    def _load_course_fact(self, cursor, id_mahasiswa: int, course_data: Dict) -> bool:
-        """Load course, time, grade dimensions and the transcript fact"""
+    def _load_mahasiswa(self, cursor, student_data: Dict) -> Optional[int]:
+        """Load or update student data and return student key"""
         try:
-            id_mk = self._get_or_create_key(
-                cursor,
-                "Dim_MataKuliah",
-                "id_mk",
-                "kode_mk",
-                course_data["kode_mk"],
-                "INSERT INTO Dim_MataKuliah (kode_mk, nama_mk, sks_mk, tahap_mk) VALUES (%s, %s, %s, %s)",
+            # Upsert on the NRP unique key; LAST_INSERT_ID(id_mahasiswa) makes
+            # lastrowid return the existing key when the student is updated
+            upsert_sql = """
+                INSERT INTO Dim_Mahasiswa (
+                    NRP, nama_mahasiswa, status_mahasiswa, ipk_kumulatif, sks_tempuh,
+                    sks_lulus, ip_persiapan, sks_persiapan, ip_sarjana, sks_sarjana
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    id_mahasiswa = LAST_INSERT_ID(id_mahasiswa),
+                    nama_mahasiswa = VALUES(nama_mahasiswa),
+                    status_mahasiswa = VALUES(status_mahasiswa),
+                    ipk_kumulatif = VALUES(ipk_kumulatif),
+                    sks_tempuh = VALUES(sks_tempuh), sks_lulus = VALUES(sks_lulus),
+                    ip_persiapan = VALUES(ip_persiapan),
+                    sks_persiapan = VALUES(sks_persiapan),
+                    ip_sarjana = VALUES(ip_sarjana), sks_sarjana = VALUES(sks_sarjana)
+            """
+            cursor.execute(
+                upsert_sql,
                 (
-                    course_data["kode_mk"],
-                    course_data["nama_mk"],
-                    course_data["sks_mk"],
-                    course_data["tahap_mk"],
+                    student_data["nrp"],
+                    student_data["nama_mahasiswa"],
+                    student_data["status_mahasiswa"],
+                    student_data["ipk"],
+                    student_data["sks_tempuh"],
+                    student_data["sks_lulus"],
+                    student_data["ip_persiapan"],
+                    student_data["sks_persiapan"],
+                    student_data["ip_sarjana"],
+                    student_data["sks_sarjana"],
                 ),
             )
+            logger.info(f"Student record saved for: {student_data['nama_mahasiswa']}")
 
-            id_waktu = self._get_or_create_key(
-                cursor,
-                "Dim_Waktu",
-                "id_waktu",
-                "tahun = %s AND semester = %s",
-                (course_data["tahun"], course_data["semester"]),
-                "INSERT INTO Dim_Waktu (tahun, semester) VALUES (%s, %s)",
-                (course_data["tahun"], course_data["semester"]),
+            return cursor.lastrowid
+        except mysql.connector.Error as err:
+            logger.error(f"Failed to load student data: {err}")
+            raise
+
+    def _build_course_fact(
+        self, id_mahasiswa: int, course_data: Course, mk_keys: Dict, waktu_keys: Dict
+    ) -> Optional[Tuple]:
+        """Build the transcript fact row for a course from resolved dimension keys"""
+        id_mk = mk_keys.get((course_data.kode_mk,))
+        id_waktu = waktu_keys.get((course_data.tahun, course_data.semester))
+        if not id_mk or not id_waktu:
+            logger.error(
+                f"Could not resolve dimension keys for '{course_data.kode_mk}'."
             )
+            return None
 
-            cursor.execute(
-                "SELECT id_nilai, bobot_nilai FROM Dim_Nilai WHERE huruf_nilai = %s",
-                (course_data["huruf_nilai"],),
+        grade = self.grade_info.get(course_data.huruf_nilai)
+        if grade is None:
+            logger.warning(
+                f"Could not find grade '{course_data.huruf_nilai}' in Dim_Nilai. Skipping fact record for {course_data.kode_mk}."
             )
-            nilai_result = cursor.fetchone()
-            if not nilai_result:
-                logger.warning(
-                    f"Could not find grade '{course_data['huruf_nilai']}' in Dim_Nilai. Skipping fact record for {course_data['kode_mk']}."
-                )
-                return False
-            id_nilai = nilai_result["id_nilai"]
-            bobot_nilai = nilai_result["bobot_nilai"]
+            return None
+        id_nilai, bobot_nilai = grade
 
-            bobot_matkul = course_data["sks_mk"] * bobot_nilai
+        bobot_matkul = course_data.sks_mk * bobot_nilai
 
-            cursor.execute(
-                "SELECT id_transkrip FROM Fact_Transkrip WHERE id_mahasiswa = %s AND id_mk = %s AND id_waktu = %s",
-                (id_mahasiswa, id_mk, id_waktu),
-            )
+        return (id_mahasiswa, id_mk, id_waktu, id_nilai, bobot_matkul)
 
-            if not cursor.fetchone():
-                cursor.execute(
-                    """INSERT INTO Fact_Transkrip 
-                    (id_mahasiswa, id_mk, id_waktu, id_nilai, bobot_matkul) 
-                    VALUES (%s, %s, %s, %s, %s)""",
-                    (id_mahasiswa, id_mk, id_waktu, id_nilai, bobot_matkul),
-                )
-                logger.debug(
-                    f"Fact record created for course: {course_data['kode_mk']}"
-                )
-            return True
-        except (mysql.connector.Error, TypeError) as err:
+    def _build_history_fact(
+        self, id_mahasiswa: int, semester_entry: Dict, waktu_keys: Dict
+    ) -> Optional[Tuple]:
+        """Build the semester history fact row from the resolved time key"""
+        id_waktu = waktu_keys.get((semester_entry["tahun"], semester_entry["semester"]))
+        if not id_waktu:
             logger.error(
-                f"Could not load course fact for '{course_data['kode_mk']}': {err}"
+                f"Failed to retrieve or create time ID for {semester_entry['tahun']}/{semester_entry['semester']}"
             )
-            return False
-
-    def _load_history_semester(
-        self, cursor, id_mahasiswa: int, semester_entry: Dict
-    ) -> bool:
-        """Load semester history data into Fact_History_Semester"""
-        try:
-            id_waktu = self._get_or_create_key(
-                cursor,
-                "Dim_Waktu",
-                "id_waktu",
-                "tahun = %s AND semester = %s",
-                (semester_entry["tahun"], semester_entry["semester"]),
-                "INSERT INTO Dim_Waktu (tahun, semester) VALUES (%s, %s)",
-                (semester_entry["tahun"], semester_entry["semester"]),
-            )
-
-            if not id_waktu:
-                logger.error(
-                    f"Failed to retrieve or create time ID for {semester_entry['tahun']}/{semester_entry['semester']}"
-                )
-                return False
+            return None
 
-            cursor.execute(
-                "SELECT id_history FROM Fact_History_Semester WHERE id_mahasiswa = %s AND id_waktu = %s",
-                (id_mahasiswa, id_waktu),
-            )
+        return (
+            id_mahasiswa,
+            id_waktu,
+            semester_entry["ips_semester"],
+            semester_entry["ipk_semester"],
+            semester_entry["jumlah_sks_semester"],
+        )
 
-            if not cursor.fetchone():
-                insert_sql = """
-                    INSERT INTO Fact_History_Semester (
-                        id_mahasiswa, id_waktu, ips_semester, ipk_semester, jumlah_sks_semester
-                    ) VALUES (%s, %s, %s, %s, %s)
+    def _upsert_history_rows(self, cursor, history_rows: List[Tuple]):
+        """Batch-upsert semester history rows on (id_mahasiswa, id_waktu)"""
+        if history_rows:
+            cursor.executemany(
                 """
-                cursor.execute(
-                    insert_sql,
-                    (
-                        id_mahasiswa,
-                        id_waktu,
-                        semester_entry["ips_semester"],
-                        semester_entry["ipk_semester"],
-                        semester_entry["jumlah_sks_semester"],
-                    ),
-                )
-                logger.debug(
-                    f"New semester history added for student {id_mahasiswa} ({semester_entry['tahun']}/{semester_entry['semester']})"
-                )
-            else:
-                update_sql = """
-                    UPDATE Fact_History_Semester SET
-                        ips_semester = %s, ipk_semester = %s, jumlah_sks_semester = %s
-                    WHERE id_mahasiswa = %s AND id_waktu = %s
-                """
-                cursor.execute(
-                    update_sql,
-                    (
-                        semester_entry["ips_semester"],
-                        semester_entry["ipk_semester"],
-                        semester_entry["jumlah_sks_semester"],
-                        id_mahasiswa,
-                        id_waktu,
-                    ),
-                )
-                logger.debug(
-                    f"Semester history updated for student {id_mahasiswa} ({semester_entry['tahun']}/{semester_entry['semester']})"
-                )
-            return True
-        except mysql.connector.Error as err:
-            logger.error(
-                f"Could not load semester history for student {id_mahasiswa} ({semester_entry['tahun']}/{semester_entry['semester']}): {err}"
+                INSERT INTO Fact_History_Semester (
+                    id_mahasiswa, id_waktu, ips_semester, ipk_semester, jumlah_sks_semester
+                ) VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    ips_semester = VALUES(ips_semester),
+                    ipk_semester = VALUES(ipk_semester),
+                    jumlah_sks_semester = VALUES(jumlah_sks_semester)
+                """,
+                history_rows,
             )
-            return False
 
-    def _get_or_create_key(
-        self, cursor, table, key_col, where_col, where_val, insert_sql, insert_val
-    ) -> Optional[int]:
-        """Generic function to get or create a dimension key."""
-        try:
-            if isinstance(where_val, tuple):
-                query = f"SELECT {key_col} FROM {table} WHERE {where_col}"
-                cursor.execute(query, where_val)
-            else:
-                query = f"SELECT {key_col} FROM {table} WHERE {where_col} = %s"
-                cursor.execute(query, (where_val,))
-
-            result = cursor.fetchone()
+    def _get_or_create_keys(
+        self, cursor, table, key_col, natural_cols, insert_sql, rows, cache
+    ) -> Dict[Tuple, int]:
+        """Get or create dimension keys for a batch of dimension rows.
+
+        `rows` maps each natural key tuple to the values used by `insert_sql`.
+        Keys found in `cache` skip the database, and resolved keys are added to it.
+        Uncached rows are upserted first (`insert_sql` must leave existing rows
+        untouched) and then read back in a single SELECT.
+        """
+        keys = {
+            natural_key: cache[natural_key]
+            for natural_key in rows
+            if natural_key in cache
+        }
+        uncached = [natural_key for natural_key in rows if natural_key not in keys]
+        if not uncached:
+            return keys
+
+        cursor.executemany(insert_sql, [rows[natural_key] for natural_key in uncached])
+        keys.update(
+            self._select_dimension_keys(cursor, table, key_col, natural_cols, uncached)
+        )
 
-            if result:
-                return result[key_col]
-            else:
-                cursor.execute(insert_sql, insert_val)
-                return cursor.lastrowid
-        except mysql.connector.Error as err:
-            logger.error(f"Problem with dimension {table}: {err}")
-            return None
+        cache.update(keys)
+        return keys
+
+    def _select_dimension_keys(
+        self, cursor, table, key_col, natural_cols, natural_keys
+    ) -> Dict[Tuple, int]:
+        """Fetch existing dimension keys for a batch of natural keys in one query."""
+        columns = ", ".join(natural_cols)
+        row_placeholder = "(" + ", ".join(["%s"] * len(natural_cols)) + ")"
+        query = (
+            f"SELECT {columns}, {key_col} FROM {table} "
+            f"WHERE ({columns}) IN ({', '.join([row_placeholder] * len(natural_keys))})"
+        )
+        cursor.execute(query, [value for key in natural_keys for value in key])
+        # Rows come back as (natural key columns..., key_col)
+        return {tuple(row[:-1]): row[-1] for row in cursor.fetchall()}
 
     def process_folder(self, folder_path: str) -> Dict[str, int]:
         """Process all PDF files in a folder"""
@@ -674,37 +803,131 @@ class TranscriptETL:
 
         stats = {"processed": 0, "failed": 0}
 
-        pdf_files = [f for f in os.listdir(folder_path) if f.lower().endswith(".pdf")]
+        if not self.connection:
+            logger.error("Cannot load data, no database connection.")
+            return stats
+
+        with os.scandir(folder_path) as entries:
+            pdf_files = [
+                entry
+                for entry in entries
+                if entry.name[-4:].lower() == ".pdf" and entry.is_file()
+            ]
         logger.info(f"Located {len(pdf_files)} PDF files for processing.")
 
-        for filename in pdf_files:
-            pdf_path = os.path.join(folder_path, filename)
-            logger.info(f"Now processing: {filename}")
+        pdf_paths = [entry.path for entry in pdf_files]
 
+        # Transcripts are committed in batches of COMMIT_BATCH_SIZE; within a
+        # batch each transcript is isolated by a savepoint in load_to_warehouse.
+        self._set_bulk_load_mode(True)
+        if len(pdf_paths) >= BULK_LOAD_MIN_FILES:
+            self._deferred_fact_rows = []
+
+        try:
+            # Extraction and parsing run in worker processes; loading stays on
+            # this process so the single database connection is never shared.
+            # Files are handed out in chunks (about four per worker) to cut
+            # the per-task IPC overhead on large folders.
+            max_workers = os.cpu_count() or 1
+            chunksize = max(1, len(pdf_paths) // (max_workers * 4))
+            batch_count = 0
+            files_seen = 0
             try:
-                text = self.extract_pdf_text(pdf_path)
-                if not text:
-                    stats["failed"] += 1
-                    continue
-
-                data = self.parse_transcript(text)
-                if not data:
-                    stats["failed"] += 1
-                    continue
-
-                if self.load_to_warehouse(data):
-                    stats["processed"] += 1
-                    logger.info(f"Finished processing: {filename}")
-                else:
-                    stats["failed"] += 1
-                    logger.error(f"Could not load data from: {filename}")
-
-            except Exception as e:
-                logger.error(f"An unexpected error occurred with {filename}: {e}")
-                stats["failed"] += 1
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    results = executor.map(
+                        _extract_and_parse,
+                        pdf_paths,
+                        repeat(self.grade_info),
+                        chunksize=chunksize,
+                    )
+
+                    for entry, data in zip(pdf_files, results):
+                        files_seen += 1
+                        filename = entry.name
+                        logger.info(f"Now processing: {filename}")
+
+                        try:
+                            if not data:
+                                stats["failed"] += 1
+                                continue
+
+                            if self.load_to_warehouse(data):
+                                stats["processed"] += 1
+                                batch_count += 1
+                                logger.info(f"Finished processing: {filename}")
+                                if batch_count >= COMMIT_BATCH_SIZE:
+                                    try:
+                                        self._commit_batch(stats, batch_count)
+                                    finally:
+                                        batch_count = 0
+                            else:
+                                stats["failed"] += 1
+                                logger.error(f"Could not load data from: {filename}")
+
+                            if self._batch_lost:
+                                # Facts deferred for the rolled back transcripts
+                                # would be orphans once bulk loaded
+                                self._batch_lost = False
+                                if self._deferred_fact_rows:
+                                    self._deferred_fact_rows.clear()
+                                stats["processed"] -= batch_count
+                                stats["failed"] += batch_count
+                                batch_count = 0
+
+                        except Exception as e:
+                            logger.error(
+                                f"An unexpected error occurred with {filename}: {e}"
+                            )
+                            stats["failed"] += 1
+            except BrokenProcessPool as err:
+                # A worker died (a native MuPDF crash or the OOM killer); the
+                # transcripts loaded so far are still committed below
+                logger.error(f"PDF worker pool terminated unexpectedly: {err}")
+                stats["failed"] += len(pdf_files) - files_seen
+
+            self._commit_batch(stats, batch_count)
+        finally:
+            self._deferred_fact_rows = None
+            self._set_bulk_load_mode(False)
 
         return stats
 
+    def _commit_batch(self, stats: Dict[str, int], batch_count: int):
+        """Commit the transcripts loaded since the last commit.
+
+        Deferred fact rows are bulk loaded first. If the batch cannot be
+        committed it is rolled back and its transcripts are counted as failed.
+        """
+        try:
+            if self._deferred_fact_rows:
+                self._bulk_load_fact_rows(self._deferred_fact_rows)
+            self.connection.commit()
+        except (mysql.connector.Error, OSError) as err:
+            logger.error(
+                f"Could not commit a batch of {batch_count} transcripts: {err}"
+            )
+            self.connection.rollback()
+            self._clear_dimension_caches()
+            stats["failed"] += batch_count
+            stats["processed"] -= batch_count
+        finally:
+            if self._deferred_fact_rows:
+                self._deferred_fact_rows.clear()
+
+    def _set_bulk_load_mode(self, enabled: bool):
+        """Toggle the session settings used while bulk loading a folder"""
+        cursor = self.connection.cursor()
+
+        try:
+            # Every foreign key is resolved from the referenced table in this
+            # same session, so the per-row checks can be skipped. unique_checks
+            # stays on because the upserts rely on duplicate key detection.
+            cursor.execute(f"SET SESSION foreign_key_checks = {0 if enabled else 1}")
+        except mysql.connector.Error as err:
+            logger.error(f"Could not change bulk load session settings: {err}")
+        finally:
+            cursor.close()
+
     def close_connection(self):
         """Close database connection"""
         if self.connection:
@@ -712,6 +935,22 @@ class TranscriptETL:
             logger.info("Connection to database has been closed.")
 
 
+def _extract_and_parse(pdf_path: str, grade_info: Dict) -> Optional[Dict]:
+    """Extract and parse one transcript in a worker process, without a database"""
+    try:
+        parser = TranscriptETL({})
+        parser.grade_info = grade_info
+
+        text = parser.extract_pdf_text(pdf_path)
+        if not text:
+            return None
+
+        return parser.parse_transcript(text)
+    except Exception as e:
+        logger.error(f"An unexpected error occurred with {pdf_path}: {e}")
+        return None
+
+
 def main():
     """Main execution function"""
     etl = TranscriptETL(DB_CONFIG)